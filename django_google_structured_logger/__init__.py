@@ -0,0 +1,5 @@
+import django
+
+if django.VERSION < (3, 2):
+    # Django < 3.2 does not discover the app config in `apps.py` on its own.
+    default_app_config = "django_google_structured_logger.apps.DjangoMaterializedViewAppConfig"
@@ -1,6 +1,21 @@
+import logging
+
 from django.apps import AppConfig  # type: ignore
 
 
 class DjangoMaterializedViewAppConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "django_google_structured_logger"
+
+    def ready(self):
+        from . import settings
+
+        if not settings.LOG_CALLER_LOOKUP_ENABLED:
+            # Skip the stack walk done for every record, for all loggers of the process.
+            # See https://docs.python.org/3/howto/logging.html#optimization
+            logging._srcfile = None
+
+        if settings.LOG_ASYNC_ENABLED:
+            from .handlers import setup_async_logging
+
+            setup_async_logging()
@@ -1,14 +1,51 @@
-from typing import Dict, Optional
+import json
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Optional
 
 from pythonjsonlogger import jsonlogger
 
 from .storages import RequestStorage, get_current_request
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore
+
+# Shared read-only default for absent labels/operation, so no empty dict is allocated per record.
+_EMPTY_MAPPING: MappingProxyType = MappingProxyType({})
+
+
+def _to_str(value) -> str:
+    return value if type(value) is str else str(value)
+
 
 class GoogleFormatter(jsonlogger.JsonFormatter):
     google_source_location_field = "logging.googleapis.com/sourceLocation"
     google_operation_field = "logging.googleapis.com/operation"
     google_labels_field = "logging.googleapis.com/labels"
+    # Labels resolved from the `RequestStorage` callable of the same name.
+    user_labels = ("user_id", "user_display_field")
+
+    def __init__(self, *args, **kwargs):
+        # None means `LOG_SOURCE_LOCATION_ENABLED`, read on first use so the formatter can
+        # be built before Django settings are configured (e.g. `dictConfig` in settings.py).
+        self._include_source_location: Optional[bool] = kwargs.pop("include_source_location", None)
+        super().__init__(*args, **kwargs)
+        # orjson is only used when the serialization is not customized beyond `json_default`.
+        # `json_ensure_ascii` is ignored on that path, orjson always writes non-ASCII as UTF-8.
+        self._use_orjson = (
+            orjson is not None
+            and self.json_serializer is json.dumps
+            and self.json_encoder in (None, jsonlogger.JsonEncoder)
+            and not self.json_indent
+        )
+        self._default = self.json_default or jsonlogger.JsonEncoder().default
+        # `json.dumps(..., cls=...)` builds a new encoder per call, so the stdlib path reuses one.
+        self._json_encode: Optional[Callable[[Any], str]] = None
+        if self.json_serializer is json.dumps:
+            self._json_encode = (self.json_encoder or json.JSONEncoder)(
+                default=self.json_default, indent=self.json_indent, ensure_ascii=self.json_ensure_ascii
+            ).encode
 
     def add_fields(self, log_record: Dict, record, message_dict: Dict):
         """
@@ -24,41 +61,62 @@ class GoogleFormatter(jsonlogger.JsonFormatter):
          - severity
          - labels
          - operation
-         - sourceLocation
+         - sourceLocation (unless `LOG_SOURCE_LOCATION_ENABLED` is False)
         """
         super().add_fields(log_record, record, message_dict)
 
-        current_request: Optional[RequestStorage] = get_current_request()
+        # Records handled through `RequestContextQueueHandler` carry their request context.
+        current_request: Optional[RequestStorage] = getattr(record, "_request_storage", None) or get_current_request()
 
         log_record["severity"] = record.levelname
 
         # Update each specialized field
         self._set_labels(log_record, current_request)
         self._set_operation(log_record, current_request)
-        self._set_source_location(log_record, record)
+        if self.include_source_location:
+            self._set_source_location(log_record, record)
+
+    @property
+    def include_source_location(self) -> bool:
+        if self._include_source_location is None:
+            from django.conf import settings as django_settings
+
+            if not django_settings.configured:
+                # Not cached, the settings may still be configured later.
+                return True
+            from . import settings
+
+            self._include_source_location = settings.LOG_SOURCE_LOCATION_ENABLED
+        return self._include_source_location
 
     def _set_labels(self, log_record: Dict, current_request: Optional[RequestStorage]):
         """Set the Google labels in the log record."""
-        labels = {
-            "user_id": current_request.user_id() if current_request else None,
-            "user_display_field": current_request.user_display_field()
-            if current_request
-            else None,
-            **log_record.get(self.google_labels_field, {}),
-            **log_record.pop("labels", {}),
-        }
-        self.stringify_values(labels)
+        labels_sources = (
+            log_record.get(self.google_labels_field, _EMPTY_MAPPING),
+            log_record.pop("labels", _EMPTY_MAPPING),
+        )
+
+        # The user lookups may hit the database, so they are skipped when the caller
+        # provides the label. Values are stringified while the dict is built.
+        labels: Dict[str, Optional[str]] = {}
+        for user_label in self.user_labels:
+            if any(user_label in labels_source for labels_source in labels_sources):
+                labels[user_label] = None  # Overwritten below, keeps the label order.
+            elif current_request:
+                labels[user_label] = _to_str(getattr(current_request, user_label)())
+            else:
+                labels[user_label] = "None"
+        for labels_source in labels_sources:
+            labels.update((key, _to_str(value)) for key, value in labels_source.items())
         log_record[self.google_labels_field] = labels
 
     def _set_operation(
         self, log_record: Dict, current_request: Optional[RequestStorage]
     ):
         """Set the Google operation details in the log record."""
-        operation = {
-            "id": getattr(current_request, "uuid", None),
-            **log_record.get(self.google_operation_field, {}),
-            **log_record.pop("operation", {}),
-        }
+        operation = {"id": getattr(current_request, "uuid", None)}
+        operation.update(log_record.get(self.google_operation_field, _EMPTY_MAPPING))
+        operation.update(log_record.pop("operation", _EMPTY_MAPPING))
 
         if "first_operation" in log_record:
             operation["first"] = log_record.pop("first_operation")
@@ -76,7 +134,51 @@ class GoogleFormatter(jsonlogger.JsonFormatter):
             "logger_name": record.name,
         }
 
+    def jsonify_log_record(self, log_record: Dict) -> str:
+        """Serialize the log record with orjson when available, else with the configured serializer."""
+        if self._use_orjson:
+            try:
+                return orjson.dumps(
+                    log_record, default=self._orjson_default, option=orjson.OPT_PASSTHROUGH_SUBCLASS
+                ).decode()
+            except TypeError:
+                pass
+            try:
+                # Non-str keys are rare and OPT_NON_STR_KEYS slows down every dict, so it
+                # is only used when the plain call failed.
+                return orjson.dumps(
+                    log_record,
+                    default=self._orjson_default,
+                    option=orjson.OPT_PASSTHROUGH_SUBCLASS | orjson.OPT_NON_STR_KEYS,
+                ).decode()
+            except TypeError:
+                # orjson rejects some values the stdlib accepts, e.g. integers above 64 bits.
+                pass
+        if self._json_encode is not None:
+            return self._json_encode(log_record)
+        return super().jsonify_log_record(log_record)
+
+    def _orjson_default(self, obj):
+        """
+        Serialize builtin subclasses the way the stdlib encoder does, e.g. a `QueryDict`
+        through its own `items()`, and anything else with the configured default.
+        """
+        if isinstance(obj, dict):
+            return dict(obj.items())
+        if isinstance(obj, list):
+            return list.copy(obj)
+        if isinstance(obj, tuple):
+            return list(tuple.__iter__(obj))
+        if isinstance(obj, str):
+            return str.__str__(obj)
+        if isinstance(obj, int):
+            return int.__int__(obj)
+        if isinstance(obj, float):
+            return float.__float__(obj)
+        return self._default(obj)
+
     @staticmethod
     def stringify_values(dict_to_convert: Dict):
-        for key in dict_to_convert:
-            dict_to_convert[key] = str(dict_to_convert[key])
+        for key, value in dict_to_convert.items():
+            if type(value) is not str:
+                dict_to_convert[key] = str(value)
@@ -1,35 +1,47 @@
 import logging
-import uuid
-from typing import Any
+import operator
 
 from . import settings
-from .storages import RequestStorage, _current_request
+from .storages import RequestStorage, _current_request, _new_operation_id, _UserAttribute
 
 logger = logging.getLogger(__name__)
 
 
 class GrapheneSetUserContextMiddleware:
+    def __init__(self):
+        self.get_user_id = operator.attrgetter(settings.LOG_USER_ID_FIELD)
+        self.get_user_display_field = operator.attrgetter(settings.LOG_USER_DISPLAY_FIELD)
+
     def resolve(self, next, root, info, **args):
         storage = _current_request.get()
+        if storage is not None and (
+            storage.graphql_context is info.context or not self._is_root_field(info)
+        ):
+            # The context was already set up for this GraphQL request, either by a
+            # previous root field or by the root of this nested field.
+            return next(root, info, **args)
+
         if storage is None:
             _current_request.set(
                 RequestStorage(
-                    uuid=str(uuid.uuid4()),
-                    user_id=lambda: self._get_user_attribute(info.context.user, settings.LOG_USER_ID_FIELD),
-                    user_display_field=lambda: self._get_user_attribute(
-                        info.context.user, settings.LOG_USER_DISPLAY_FIELD
-                    ),
+                    uuid=_new_operation_id(),
+                    user_id=_UserAttribute(info.context, self.get_user_id),
+                    user_display_field=_UserAttribute(info.context, self.get_user_display_field),
+                    graphql_context=info.context,
                 )
             )
         else:
-            storage.uuid = storage.uuid or str(uuid.uuid4())
-            storage.user_id = lambda: self._get_user_attribute(info.context.user, settings.LOG_USER_ID_FIELD)
-            storage.user_display_field = lambda: self._get_user_attribute(
-                info.context.user, settings.LOG_USER_DISPLAY_FIELD
-            )
+            storage.uuid = storage.uuid or _new_operation_id()
+            storage.user_id = _UserAttribute(info.context, self.get_user_id)
+            storage.user_display_field = _UserAttribute(info.context, self.get_user_display_field)
+            storage.graphql_context = info.context
 
         return next(root, info, **args)
 
     @staticmethod
-    def _get_user_attribute(user, attribute) -> Any:
-        return getattr(user, attribute, None)
+    def _is_root_field(info) -> bool:
+        # graphql-core 3 exposes the path as a linked list, graphql-core 2 as a list of keys.
+        path = info.path
+        if isinstance(path, list):
+            return len(path) <= 1
+        return getattr(path, "prev", None) is None
@@ -0,0 +1,171 @@
+import atexit
+import copy
+import logging
+import os
+import queue
+import weakref
+from logging.handlers import QueueHandler, QueueListener
+from typing import List, Optional, Tuple
+
+from .storages import RequestStorage, get_current_request
+
+_exception_formatter = logging.Formatter()
+
+
+class BufferedStreamHandler(logging.StreamHandler):
+    """
+    StreamHandler that batches formatted records into a single `write()`.
+
+    Records are kept in memory until `buffer_size` characters are collected or a
+    record at `flush_level` or above is emitted. Pending records are written when
+    the handler is flushed or closed, which `logging.shutdown()` does at exit.
+
+    Example:
+    "handlers": {
+        "google-json-handler": {
+            "class": "django_google_structured_logger.handlers.BufferedStreamHandler",
+            "formatter": "json",
+        },
+    }
+    """
+
+    def __init__(self, stream=None, buffer_size: int = 65536, flush_level: int = logging.WARNING):
+        super().__init__(stream)
+        self.buffer_size = buffer_size
+        self.flush_level = flush_level
+        self._buffer: List[str] = []
+        self._buffered_size = 0
+        _buffered_stream_handlers.add(self)
+
+    def emit(self, record: logging.LogRecord):
+        try:
+            msg = self.format(record) + self.terminator
+            self._buffer.append(msg)
+            self._buffered_size += len(msg)
+            if record.levelno >= self.flush_level or self._buffered_size >= self.buffer_size:
+                self.flush()
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+
+    def flush(self):
+        self.acquire()
+        try:
+            if self._buffer and self.stream:
+                self.stream.write("".join(self._buffer))
+            self._buffer.clear()
+            self._buffered_size = 0
+            super().flush()
+        finally:
+            self.release()
+
+    def close(self):
+        try:
+            self.flush()
+        finally:
+            super().close()
+
+    def _clear_buffer(self):
+        self._buffer.clear()
+        self._buffered_size = 0
+
+
+# Live `BufferedStreamHandler` instances, see `_clear_buffers`.
+_buffered_stream_handlers: "weakref.WeakSet[BufferedStreamHandler]" = weakref.WeakSet()
+
+
+def _clear_buffers():
+    # A forked child inherits the records buffered by its parent, which the parent
+    # still writes itself; without this every child would write them again.
+    for handler in _buffered_stream_handlers:
+        handler._clear_buffer()
+
+
+class RequestContextQueueHandler(QueueHandler):
+    """
+    QueueHandler that keeps the request context of the record.
+
+    The record is handled on the `QueueListener` thread, where the request context
+    variable is not set. The current `RequestStorage` is therefore resolved here, on
+    the logging thread, and attached to the record for `GoogleFormatter`.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Unlike the base implementation, the record is not pre-formatted, so the
+        # listener's formatter still sees dict messages, traceback and stack separately.
+        record = copy.copy(record)
+        if record.args:
+            record.msg = record.getMessage()
+            record.args = None
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = _exception_formatter.formatException(record.exc_info)
+            record.exc_info = None
+
+        storage = get_current_request()
+        if storage is not None:
+            user_id = storage.user_id()
+            user_display_field = storage.user_display_field()
+            record._request_storage = RequestStorage(
+                uuid=storage.uuid,
+                user_id=lambda: user_id,
+                user_display_field=lambda: user_display_field,
+            )
+        return record
+
+
+def setup_async_logging(logger_name: Optional[str] = None) -> QueueListener:
+    """
+    Move the handlers of a logger behind a queue drained by a background thread.
+
+    Logging calls then only enqueue the record; formatting and writing happen on the
+    `QueueListener` thread, which is stopped (and drained) at interpreter exit.
+
+    Example:
+    Input: None (root logger with a StreamHandler)
+    Output: Root logger with a RequestContextQueueHandler, the StreamHandler runs on the listener
+    """
+    target_logger = logging.getLogger(logger_name)
+    handlers = list(target_logger.handlers)
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    queue_handler = RequestContextQueueHandler(log_queue)
+
+    for handler in handlers:
+        target_logger.removeHandler(handler)
+    target_logger.addHandler(queue_handler)
+
+    listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    _async_logging.append((queue_handler, listener))
+    atexit.register(_stop_listener, listener)
+    return listener
+
+
+# Queue handlers and listeners set up by `setup_async_logging`, see `_restart_listeners`.
+_async_logging: List[Tuple[RequestContextQueueHandler, QueueListener]] = []
+
+
+def _stop_listener(listener: QueueListener):
+    # `QueueListener.stop()` fails when the listener was already stopped by the caller.
+    if listener._thread is not None:
+        listener.stop()
+
+
+def _restart_listeners():
+    # Threads do not survive `fork()`, so without this a child forked after the setup
+    # (e.g. gunicorn `--preload`, uWSGI) would enqueue records nothing reads. The queue
+    # is replaced as well, since the parent's listener may have held its lock.
+    for queue_handler, listener in _async_logging:
+        if listener._thread is None:
+            continue
+        log_queue: queue.SimpleQueue = queue.SimpleQueue()
+        queue_handler.queue = log_queue
+        listener.queue = log_queue
+        listener._thread = None
+        listener.start()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_clear_buffers)
+    os.register_at_fork(after_in_child=_restart_listeners)
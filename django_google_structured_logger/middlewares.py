@@ -1,54 +1,294 @@
 import json
 import logging
+import operator
 import re
-import uuid
-from copy import deepcopy
-from typing import Any, Dict, List, Optional, Union
+import sys
+from functools import lru_cache
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Pattern, Set, Tuple, Union
 
+from django.core.exceptions import ImproperlyConfigured, MiddlewareNotUsed
 from django.http import HttpRequest, HttpResponse
 
 from . import settings
-from .storages import RequestStorage, _current_request
+from .storages import RequestStorage, _current_request, _new_operation_id, _UserAttribute
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore
 
 logger = logging.getLogger(__name__)
 
 
+# orjson parses integers beyond 64 bits as (lossy) floats, so any run of 19 or more
+# digits sends the body to the stdlib parser, which keeps them exact.
+_LONG_DIGIT_RUN = re.compile(rb"\d{19}")
+
+
+def _json_loads(data: Union[bytes, str]) -> Any:
+    """Parse JSON with orjson when it is installed, falling back to the stdlib."""
+    if orjson is not None:
+        raw = data.encode() if isinstance(data, str) else data
+        if _LONG_DIGIT_RUN.search(raw) is None:
+            try:
+                return orjson.loads(raw)
+            except orjson.JSONDecodeError:
+                # orjson is stricter than the stdlib (e.g. NaN, Infinity).
+                pass
+    return json.loads(data)
+
+
+class _SensitiveKeyMatcher:
+    """
+    Match keys against sensitive key rules.
+
+    A rule is either a regex string matched against the start of the key, or a
+    `(mode, value)` pair (tuple or list) where mode is one of "exact", "prefix", "contains" or
+    "regex". Regex strings of the trivial shapes `^word$`, `^word.*` and `.*word.*`
+    are converted to the equivalent literal rule. Literal rules are checked with
+    plain string operations on the lowercased key; the remaining regexes are matched
+    case-insensitively without leading `.*`, fused into one alternation where possible.
+
+    Example:
+    Input: ["^password$", ".*token.*", ("prefix", "bearer")], key "X-Auth-Token"
+    Output: True
+    """
+
+    _exact_shape = re.compile(r"\^([\w-]+)\$")
+    _prefix_shape = re.compile(r"\^([\w-]+)\.\*")
+    _contains_shape = re.compile(r"\.\*([\w-]+)\.\*")
+    _global_flags = re.compile(r"\(\?[aiLmsux]+\)")
+    _leading_greedy_dot_star = re.compile(r"\.\*(?![?+{])")
+
+    def __init__(self, rules: Iterable[Union[str, Tuple[str, str], List[str]]]):
+        exact: Set[str] = set()
+        prefixes: List[str] = []
+        substrings: List[str] = []
+        regexes: List[str] = []
+        for rule in rules:
+            if isinstance(rule, str):
+                mode, value = self._parse_rule(rule)
+            elif isinstance(rule, (list, tuple)) and len(rule) == 2 and isinstance(rule[1], str):
+                # Lists are accepted too, as settings read from JSON or the environment have no tuples.
+                mode, value = rule
+            else:
+                raise ImproperlyConfigured(f"Invalid sensitive key rule {rule!r}.")
+            if mode == "exact":
+                exact.add(value.lower())
+            elif mode == "prefix":
+                prefixes.append(value.lower())
+            elif mode == "contains":
+                substrings.append(value.lower())
+            elif mode == "regex":
+                regexes.append(self._to_search_pattern(value))
+            else:
+                raise ImproperlyConfigured(f"Invalid sensitive key rule {rule!r}.")
+
+        self.exact = frozenset(exact)
+        self.prefixes = tuple(prefixes)
+        self.substrings = tuple(substrings)
+        self.regexes = self._compile_regexes(regexes)
+
+    def match(self, key: Any) -> bool:
+        key = str(key)
+        lowered_key = key.lower()
+        return (
+            lowered_key in self.exact
+            or lowered_key.startswith(self.prefixes)
+            or any(substring in lowered_key for substring in self.substrings)
+            or any(regex.search(key) is not None for regex in self.regexes)
+        )
+
+    @classmethod
+    def _compile_regexes(cls, patterns: List[str]) -> Tuple[Pattern, ...]:
+        """
+        Compile the regex rules, fusing those without groups into a single alternation.
+
+        Rules with groups or inline flags keep their own pattern, as group names and
+        backreference numbers would clash or shift in the alternation, and flags are
+        only allowed at its start. If the fused pattern still does not compile, every
+        rule is kept separate.
+
+        Example:
+        Input: ["credit.*card", "(?P<x>a)(?P=x)"]
+        Output: (re.compile("(?:credit.*card)"), re.compile("(?P<x>a)(?P=x)"))
+        """
+        compiled = [re.compile(pattern, flags=re.IGNORECASE) for pattern in patterns]
+        fusable = [regex for regex in compiled if cls._is_fusable(regex)]
+        if len(fusable) < 2:
+            return tuple(compiled)
+        try:
+            fused = re.compile("|".join(regex.pattern for regex in fusable), flags=re.IGNORECASE)
+        except re.error:
+            return tuple(compiled)
+        return (fused, *(regex for regex in compiled if not cls._is_fusable(regex)))
+
+    @classmethod
+    def _is_fusable(cls, regex: Pattern) -> bool:
+        return not regex.groups and not cls._global_flags.match(regex.pattern)
+
+    @classmethod
+    def _parse_rule(cls, pattern: str) -> Tuple[str, str]:
+        """
+        Convert a regex string to the equivalent literal rule where possible.
+
+        Example:
+        Input: ".*token.*"
+        Output: ("contains", "token")
+        """
+        if match := cls._exact_shape.fullmatch(pattern):
+            return "exact", match.group(1)
+        if match := cls._prefix_shape.fullmatch(pattern):
+            return "prefix", match.group(1)
+        if match := cls._contains_shape.fullmatch(pattern):
+            return "contains", match.group(1)
+        return "regex", pattern
+
+    @classmethod
+    def _to_search_pattern(cls, pattern: str) -> str:
+        """
+        Rewrite a pattern meant for `re.match` into one for `re.search`.
+
+        A leading `.*` only makes the engine backtrack over the whole key, and a
+        trailing `.*` never changes the outcome, so both are dropped when the
+        pattern has no top-level alternation. Otherwise the pattern is anchored.
+        Leading inline flags such as `(?s)` are kept at the start of the pattern.
+
+        Example:
+        Input: ".*credit.*card.*"
+        Output: "credit.*card"
+        """
+        flags_match = cls._global_flags.match(pattern)
+        flags = flags_match.group() if flags_match else ""
+        pattern = pattern[len(flags) :]
+        anchored = rf"{flags}\A(?:{pattern})"
+        if "|" in pattern:
+            return anchored
+        while pattern.endswith(".*") and not pattern.endswith(r"\.*"):
+            pattern = pattern[:-2]
+        if not cls._leading_greedy_dot_star.match(pattern):
+            return rf"{flags}\A(?:{pattern})"
+        # A lazy or possessive `.*` (e.g. `.*?token`) is not stripped, as that would
+        # leave a dangling quantifier.
+        while cls._leading_greedy_dot_star.match(pattern):
+            pattern = pattern[2:]
+        search_pattern = f"{flags}(?:{pattern})"
+        try:
+            re.compile(search_pattern)
+        except re.error:
+            return anchored
+        return search_pattern
+
+
+_sensitive_keys_matcher = _SensitiveKeyMatcher(settings.LOG_SENSITIVE_KEYS)
+
+# Paths starting with any of these prefixes are never logged.
+_IGNORED_PATH_PREFIXES = ("__",)
+
+# Excluded header names are kept in a tuple up to this count, in a frozenset above it.
+_MAX_EXCLUDED_HEADERS_TUPLE_LEN = 8
+
+# Log level of a response by status class (`status_code // 100`), WARNING when absent.
+_get_status_class_level = {2: logging.INFO}.get
+
+
+# Markers of masked and abridged values.
+_FULL_MASK = "...FULL_MASKED..."
+_PARTIAL_MASK = "...MASKED..."
+_SHORTENED = "..SHORTENED"
+_DEPTH_EXCEEDED = "..DEPTH EXCEEDED"
+
+
+def _complete_mask(value):
+    return _FULL_MASK
+
+
+def _partial_mask(value):
+    if not value:
+        return value
+    value = str(value)
+    length = len(value)
+    if length <= 4:
+        return _complete_mask(value)
+    slice_value = min(4, length // 4)
+    return f"{value[:slice_value]}{_PARTIAL_MASK}{value[-slice_value:]}"
+
+
+_MASK_FUNCTIONS = {
+    "complete": _complete_mask,
+    "partial": _partial_mask,
+}
+
+
+@lru_cache(maxsize=None)
+def _get_mask_function(style):
+    mask_function = _MASK_FUNCTIONS.get(style)
+    if mask_function is None:
+        logger.warning(f"Invalid mask style {style}. Using default style 'partial'.")
+        mask_function = _partial_mask
+    return mask_function
+
+
+class _WalkFrame:
+    """A dict or list being rebuilt by `LogRequestAndResponseMiddleware._abridge_and_mask`."""
+
+    __slots__ = ("value", "depth", "keys", "items", "results", "changed")
+
+    def __init__(self, value: Any, depth: int, keys: Optional[List[Any]], items: List[Any], changed: bool):
+        self.value = value
+        self.depth = depth
+        self.keys = keys  # None for lists
+        self.items = items
+        self.results: List[Any] = []
+        self.changed = changed
+
+
 class SetUserContextMiddleware:
     def __init__(self, get_response):
         self.get_response = get_response
+        self.get_user_id = operator.attrgetter(settings.LOG_USER_ID_FIELD)
+        self.get_user_display_field = operator.attrgetter(settings.LOG_USER_DISPLAY_FIELD)
 
     def __call__(self, request):
         _current_request.set(
             RequestStorage(
-                uuid=str(uuid.uuid4()),
-                user_id=lambda: self._get_user_attribute(
-                    request.user, settings.LOG_USER_ID_FIELD
-                ),
-                user_display_field=lambda: self._get_user_attribute(
-                    request.user, settings.LOG_USER_DISPLAY_FIELD
-                ),
+                uuid=_new_operation_id(),
+                user_id=_UserAttribute(request, self.get_user_id),
+                user_display_field=_UserAttribute(request, self.get_user_display_field),
             )
         )
         return self.get_response(request)
 
-    @staticmethod
-    def _get_user_attribute(user, attribute) -> Any:
-        return getattr(user, attribute, None)
-
 
 class LogRequestAndResponseMiddleware:
     """Middleware for logging requests and responses with sensitive data masked."""
 
     def __init__(self, get_response):
+        if not settings.LOG_MIDDLEWARE_ENABLED:
+            # Django then leaves the middleware out of the chain, so it costs nothing per request.
+            raise MiddlewareNotUsed("LOG_MIDDLEWARE_ENABLED is False.")
         self.get_response = get_response
-        self.log_excluded_headers_set = set(
-            map(str.lower, settings.LOG_EXCLUDED_HEADERS)
+        # A few names are scanned faster as a tuple than hashed for a set lookup.
+        excluded_headers = tuple(dict.fromkeys(map(str.lower, settings.LOG_EXCLUDED_HEADERS)))
+        self.log_excluded_headers_set: Union[Tuple[str, ...], FrozenSet[str]] = (
+            excluded_headers
+            if len(excluded_headers) <= _MAX_EXCLUDED_HEADERS_TUPLE_LEN
+            else frozenset(excluded_headers)
         )
+        # Settings are read once here, so the per-request paths only do instance lookups.
+        self.excluded_endpoints = frozenset(settings.LOG_EXCLUDED_ENDPOINTS)
+        self.max_str_len = settings.LOG_MAX_STR_LEN
+        self.max_list_len = settings.LOG_MAX_LIST_LEN
+        self.max_depth = settings.LOG_MAX_DEPTH
+        self.mask_func = _get_mask_function(settings.LOG_MASK_STYLE)
+        self.max_request_json_body_size = settings.LOG_MAX_REQUEST_JSON_BODY_SIZE
+        self.body_handlers = {
+            "application/json": self._json_body,
+            "multipart/form-data": self._multipart_body,
+            "text/plain": self._text_body,
+        }
 
     def __call__(self, request: HttpRequest) -> HttpResponse:
-        if not settings.LOG_MIDDLEWARE_ENABLED:
-            return self.get_response(request)
-
         self.process_request(request)
         response = self.get_response(request)
         self.process_response(request, response)
@@ -62,36 +302,27 @@ class LogRequestAndResponseMiddleware:
         Input: Django request object
         Output: Logs the necessary details of the request
         """
-        if self._is_ignored(request):
+        if self._is_ignored(request) or not logger.isEnabledFor(logging.INFO):
             return request
 
         try:
-            path = self._empty_value_none(getattr(request, "path", None))
-            method = self._empty_value_none(getattr(request, "method", None))
-            content_type = self._empty_value_none(
-                getattr(request, "content_type", None)
-            )
-            request_body = self._empty_value_none(getattr(request, "body", None))
+            path = self._empty_value_none(request.path)
+            method = self._empty_value_none(request.method)
+            content_type = self._empty_value_none(request.content_type)
+            request_body = self._empty_value_none(request.body)
             request_data = {
                 "request": {
-                    "body": self._get_request_body(content_type, request_body),
-                    "query_params": self._empty_value_none(
-                        getattr(request, "GET", None)
-                    ),
+                    "body": self._get_request_body(content_type, request_body, self.max_request_json_body_size),
+                    "query_params": self._empty_value_none(request.GET),
                     "content_type": content_type,
                     "method": method,
                     "path": path,
-                    "headers": self._empty_value_none(
-                        self._exclude_keys(getattr(request, "headers", None))
-                    ),
+                    "headers": self._empty_value_none(self._exclude_keys(request.headers)),
                 },
                 "first_operation": True,
             }
 
-            logger.info(
-                f"Request {method} {path}",
-                extra=request_data,
-            )
+            self._log(logging.INFO, f"Request {method} {path}", request_data)
         except Exception as exc:
             logger.exception(exc)
 
@@ -107,16 +338,16 @@ class LogRequestAndResponseMiddleware:
             return response
 
         try:
-            response_data = self._abridge(getattr(response, "data", None))
-            if response_data is None:
-                response_content = self._abridge(getattr(response, "content", None))
-                content_type = self._empty_value_none(
-                    getattr(request, "content_type", None)
-                )
-                response_data = (
-                    self._get_request_body(content_type, response_content),
-                )
             response_status_code = getattr(response, "status_code", 0)
+            level = _get_status_class_level(response_status_code // 100, logging.WARNING)
+            if not logger.isEnabledFor(level):
+                return response
+
+            response_data = self._abridge_and_mask(getattr(response, "data", None))
+            if response_data is None:
+                response_content = getattr(response, "content", None)
+                content_type = self._empty_value_none(request.content_type)
+                response_data = self._get_request_body(content_type, response_content)
             response_headers = self._exclude_keys(getattr(response, "headers", None))
 
             data = {
@@ -131,45 +362,103 @@ class LogRequestAndResponseMiddleware:
             log_message = (
                 f"Response {request.method} {request.path} > {response_status_code}"
             )
-            logger_method = (
-                logger.info if 199 < response_status_code < 300 else logger.warning
-            )
-            logger_method(log_message, extra=data)
+            self._log(level, log_message, data)
 
         except Exception as exc:
             logger.exception(exc)
 
         return response
 
-    def _abridge(self, data: Any, current_depth: int = 0) -> Any:
+    @staticmethod
+    def _log(level: int, msg: str, extra: Dict):
         """
-        Abridge data based on length settings and depth.
+        Log `msg` with `extra`, once the caller checked that `level` is enabled.
 
-        Example:
-        Input: {"name": "Very long name..."}
-        Output: {"name": "Very long...SHORTENED"}
+        Same record as `logger.log(level, msg, extra=extra)`, but the record is built
+        and handled directly: the caller's frame is known, so the stack walk of
+        `Logger.findCaller` is skipped (as is the whole lookup when
+        `logging._srcfile` is None).
         """
-        max_str_len = settings.LOG_MAX_STR_LEN
-        max_list_len = settings.LOG_MAX_LIST_LEN
-        max_depth = settings.LOG_MAX_DEPTH
+        if logging._srcfile:
+            frame = sys._getframe(1)
+            fn, lno, func = frame.f_code.co_filename, frame.f_lineno, frame.f_code.co_name
+        else:
+            fn, lno, func = "(unknown file)", 0, "(unknown function)"
+        logger.handle(logger.makeRecord(logger.name, level, fn, lno, msg, (), None, func, extra))
 
-        # Check for the depth threshold
-        if current_depth > max_depth:
-            return "..DEPTH EXCEEDED"
+    def _abridge_and_mask(self, data: Any, current_depth: int = 0) -> Any:
+        """
+        Abridge data based on length settings and depth, and mask sensitive values.
 
-        if isinstance(data, dict):
-            data = {
-                k: self._abridge(v, current_depth + 1)
-                for k, v in data.items()
-                if k != "meta"
-            }
-        elif isinstance(data, str) and max_str_len and len(data) > max_str_len:
-            return "{value}..SHORTENED".format(value=data[:max_str_len])
-        elif isinstance(data, list) and max_list_len:
-            return [
-                self._abridge(item, current_depth + 1) for item in data[:max_list_len]
-            ]
-        return data
+        Both are done in a single walk over the data, masking the values of
+        sensitive keys at any nesting level. The walk uses an explicit stack
+        instead of recursion and is copy-on-write: a dict or list is only rebuilt
+        when one of its items changed, otherwise the original object is kept.
+
+        Lists longer than `max_list_len` end with a "..TRUNCATED(n)" item, n being the
+        number of items left out.
+
+        Example:
+        Input: {"name": "Very long name...", "user": {"password": "my_secret_pass"}}
+        Output: {"name": "Very long...SHORTENED", "user": {"password": "my_s...MASKED...pass"}}
+        """
+        max_str_len = self.max_str_len
+        max_list_len = self.max_list_len
+        max_depth = self.max_depth
+        mask_func = self.mask_func
+        is_sensitive = _sensitive_keys_matcher.match
+
+        stack: List[_WalkFrame] = []
+        result: Any
+        value, depth, sensitive = data, current_depth, False
+        while True:
+            # Descend until the result of `value` is known or its first item is reached.
+            if depth > max_depth:
+                result = _DEPTH_EXCEEDED
+            elif sensitive:
+                result = mask_func(value)
+            elif isinstance(value, dict) or (isinstance(value, list) and max_list_len):
+                keys: Optional[List[Any]] = None
+                if isinstance(value, dict):
+                    keys = [k for k in value if k != "meta"]
+                    items = [value[k] for k in keys]
+                else:
+                    items = value if len(value) <= max_list_len else value[:max_list_len]
+                # Dropped "meta" keys and truncated lists always need a new container.
+                changed = len(items) != len(value)
+                if items:
+                    stack.append(_WalkFrame(value, depth, keys, items, changed))
+                    value, depth, sensitive = items[0], depth + 1, keys is not None and is_sensitive(keys[0])
+                    continue
+                result = ({} if keys is not None else []) if changed else value
+            elif isinstance(value, str) and max_str_len and len(value) > max_str_len:
+                result = f"{value[:max_str_len]}{_SHORTENED}"
+            else:
+                result = value
+
+            # Ascend, completing every container whose last item was just processed.
+            while stack:
+                frame = stack[-1]
+                index = len(frame.results)
+                frame.changed = frame.changed or result is not frame.items[index]
+                frame.results.append(result)
+                index += 1
+                if index < len(frame.items):
+                    value, depth = frame.items[index], frame.depth + 1
+                    sensitive = frame.keys is not None and is_sensitive(frame.keys[index])
+                    break
+                stack.pop()
+                if not frame.changed:
+                    result = frame.value
+                elif frame.keys is not None:
+                    result = dict(zip(frame.keys, frame.results))
+                else:
+                    result = frame.results
+                    omitted = len(frame.value) - len(frame.items)
+                    if omitted:
+                        result.append(f"..TRUNCATED({omitted})")
+            else:
+                return result
 
     @staticmethod
     def _empty_value_none(obj: Union[Dict, str, None]) -> Union[Dict, str, None]:
@@ -182,73 +471,6 @@ class LogRequestAndResponseMiddleware:
         """
         return obj if bool(obj) else None
 
-    @staticmethod
-    def _mask_sensitive_data(obj: Any) -> Union[str, Dict, None]:
-        """Mask sensitive data in a dictionary based on specified keys and masking style.
-
-        Args:
-            obj: Dictionary containing potential sensitive data.
-
-        Returns:
-            dict: A new dictionary with sensitive data masked.
-
-        Example:
-            Given:
-            obj = {"password": "my_secret_pass"}
-
-            Returns based on style:
-            - complete: {"password": "...FULL_MASKED..."}
-            - partial: {"password": "my_s...MASKED...pass"}
-        """
-        if not isinstance(obj, dict):
-            return obj
-
-        data = deepcopy(obj)
-        data_keys = list(map(str, data.keys()))
-
-        sensitive_keys = settings.LOG_SENSITIVE_KEYS
-        mask_style = settings.LOG_MASK_STYLE
-
-        def get_mask_function(style):
-            def complete_mask(value):
-                return "...FULL_MASKED..."
-
-            def partial_mask(value):
-                if not value:
-                    return value
-                length = len(value)
-                if length <= 4:
-                    return complete_mask(value)
-                slice_value = min(4, length // 4)
-                return "{prefix_value}...MASKED...{suffix_value}".format(
-                    prefix_value=value[:slice_value], suffix_value=value[-slice_value:]
-                )
-
-            mask_styles = {
-                "complete": complete_mask,
-                "partial": partial_mask,
-            }
-            _mask_style = mask_styles.get(style)
-            if _mask_style is None:
-                logger.warning(
-                    f"Invalid mask style {style}. Using default style 'partial'."
-                )
-                _mask_style = partial_mask
-            return _mask_style
-
-        mask_func = get_mask_function(mask_style)
-
-        def _mask(_sensitive_keys: List[str]):
-            for sensitive_key in _sensitive_keys:
-                r = re.compile(sensitive_key, flags=re.IGNORECASE)
-                match_keys = filter(r.match, data_keys)
-                for key in match_keys:
-                    data[key] = mask_func(data[key])
-
-        _mask(sensitive_keys)
-
-        return data
-
     def _exclude_keys(self, obj: Optional[Dict]) -> Optional[Dict]:
         """
         Exclude specific keys from a dictionary.
@@ -259,40 +481,53 @@ class LogRequestAndResponseMiddleware:
         """
         if obj is None:
             return None
+        if not self.log_excluded_headers_set:
+            return dict(obj)
         return {
             k: v
             for k, v in obj.items()
             if k.lower() not in self.log_excluded_headers_set
         }
 
-    def _get_request_body(self, content_type, request_body) -> Union[str, Dict, None]:
+    def _get_request_body(
+        self, content_type, request_body, max_json_body_size: Optional[int] = None
+    ) -> Union[str, Dict, None]:
         """
         Extract request body and mask sensitive data.
 
+        The body handler is picked by the media type, ignoring parameters such as
+        `charset`. Unknown content types are logged as the content type itself.
+
         Example:
-        Input: Django request object with JSON body {"key": "value" }
+        Input: "application/json; charset=utf-8", b'{"key": "value"}'
         Output: {"key": "value"}
         """
-
-        def decode_and_abridge(body_bytes):
+        media_type = content_type.split(";", 1)[0].strip().lower() if content_type else ""
+        body_handler = self.body_handlers.get(media_type)
+        if body_handler is None:
+            return content_type
+        if media_type == "application/json" and max_json_body_size and len(request_body or b"") > max_json_body_size:
+            return _SHORTENED
+        return body_handler(request_body)
+
+    def _json_body(self, body_bytes) -> Union[str, Dict, None]:
+        """Parse, abridge and mask a JSON body, falling back to the raw text."""
+        try:
+            return self._abridge_and_mask(_json_loads(body_bytes))
+        except Exception:  # noqa
             body_str = body_bytes.decode("UTF-8") if body_bytes else None
-            try:
-                return self._abridge(json.loads(body_str))
-            except Exception:  # noqa
-                return self._abridge(body_str)
-
-        # Using traditional conditional checks instead of `match` for Python < 3.10 compatibility
-        if content_type == "multipart/form-data":
-            return "The image was uploaded to the server"
-        elif content_type == "application/json":
-            return self._mask_sensitive_data(decode_and_abridge(request_body))
-        elif content_type == "text/plain":
-            return self._mask_sensitive_data(self._abridge(request_body))
-        else:
-            return self._mask_sensitive_data(content_type)
+            return self._abridge_and_mask(body_str)
+
+    def _text_body(self, body_bytes) -> Union[str, Dict, None]:
+        """Abridge a plain text body."""
+        return self._abridge_and_mask(body_bytes)
 
     @staticmethod
-    def _is_ignored(request) -> bool:
+    def _multipart_body(body_bytes) -> str:
+        """Multipart bodies are not logged."""
+        return "The image was uploaded to the server"
+
+    def _is_ignored(self, request) -> bool:
         """
         Determine if the request should be ignored based on path.
 
@@ -300,6 +535,5 @@ class LogRequestAndResponseMiddleware:
         Input: Django request object with the path "__ignore_me__"
         Output: True
         """
-        default_ignored = request.path.startswith("__")
-        user_ignored = request.path in settings.LOG_EXCLUDED_ENDPOINTS
-        return default_ignored or user_ignored
+        path = request.path
+        return path.startswith(_IGNORED_PATH_PREFIXES) or path in self.excluded_endpoints
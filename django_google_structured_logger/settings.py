@@ -4,6 +4,7 @@ from django_google_structured_logger.constants import DEFAULT_SENSITIVE_HEADERS,
 
 LOG_MAX_STR_LEN = getattr(settings, "LOG_MAX_STR_LEN", 200)
 LOG_MAX_LIST_LEN = getattr(settings, "LOG_MAX_LIST_LEN", 10)
+LOG_MAX_REQUEST_JSON_BODY_SIZE = getattr(settings, "LOG_MAX_REQUEST_JSON_BODY_SIZE", None)
 LOG_EXCLUDED_ENDPOINTS = getattr(settings, "LOG_EXCLUDED_ENDPOINTS", [])
 LOG_SENSITIVE_KEYS = getattr(settings, "LOG_SENSITIVE_KEYS", DEFAULT_SENSITIVE_KEYS)
 LOG_MASK_STYLE = getattr(settings, "LOG_MASK_STYLE", "partial")
@@ -12,3 +13,6 @@ LOG_EXCLUDED_HEADERS = getattr(settings, "LOG_EXCLUDED_HEADERS", DEFAULT_SENSITI
 LOG_USER_ID_FIELD = getattr(settings, "LOG_USER_ID_FIELD", "id")
 LOG_USER_DISPLAY_FIELD = getattr(settings, "LOG_USER_DISPLAY_FIELD", "email")
 LOG_MAX_DEPTH = getattr(settings, "LOG_MAX_DEPTH", 4)
+LOG_SOURCE_LOCATION_ENABLED = getattr(settings, "LOG_SOURCE_LOCATION_ENABLED", True)
+LOG_CALLER_LOOKUP_ENABLED = getattr(settings, "LOG_CALLER_LOOKUP_ENABLED", True)
+LOG_ASYNC_ENABLED = getattr(settings, "LOG_ASYNC_ENABLED", False)
@@ -1,13 +1,49 @@
+import os
+import sys
+import threading
 from contextvars import ContextVar
 from dataclasses import dataclass
-from typing import Callable, Optional
+from typing import Any, Callable, Optional
 
 
-@dataclass()
+# `slots` is only supported by `dataclass` from Python 3.10 on.
+_DATACLASS_OPTIONS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(**_DATACLASS_OPTIONS)
 class RequestStorage:
     uuid: str
     user_id: Callable[[], Optional[int]] = lambda: None
     user_display_field: Callable[[], Optional[str]] = lambda: None
+    # GraphQL context the storage was last set up for, see `GrapheneSetUserContextMiddleware`.
+    graphql_context: Any = None
+
+
+class _UserAttribute:
+    """
+    Lazily look up an attribute of `owner.user`, caching it once it is set.
+
+    `owner.user` is read until the attribute has a value, as the user may be replaced
+    after the middleware ran (e.g. by DRF authentication). From then on the cached
+    value is returned, so each log record does not walk the (lazy) user object again.
+    `getter` is an `operator.attrgetter`, so dotted fields such as "profile.email" work.
+    """
+
+    __slots__ = ("owner", "getter", "value")
+
+    def __init__(self, owner: Any, getter: Callable[[Any], Any]):
+        self.owner = owner
+        self.getter = getter
+        self.value: Any = None
+
+    def __call__(self) -> Any:
+        if self.value is None:
+            user = self.owner.user
+            try:
+                self.value = self.getter(user)
+            except AttributeError:
+                pass
+        return self.value
 
 
 _current_request: ContextVar[Optional[RequestStorage]] = ContextVar("_current_request", default=None)
@@ -15,3 +51,27 @@ _current_request: ContextVar[Optional[RequestStorage]] = ContextVar("_current_re
 
 def get_current_request() -> Optional[RequestStorage]:
     return _current_request.get()
+
+
+# Operation ids are 16 random bytes as hex. They are drawn from `os.urandom` in
+# batches per thread, saving a syscall per request.
+_OPERATION_ID_BATCH_SIZE = 128
+_operation_ids = threading.local()
+
+
+def _new_operation_id() -> str:
+    ids = getattr(_operation_ids, "ids", None)
+    if not ids:
+        random_hex = os.urandom(16 * _OPERATION_ID_BATCH_SIZE).hex()
+        ids = _operation_ids.ids = [random_hex[i : i + 32] for i in range(0, len(random_hex), 32)]
+    return ids.pop()
+
+
+def _reset_operation_ids():
+    # A forked child must not hand out the ids buffered by its parent.
+    global _operation_ids
+    _operation_ids = threading.local()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_operation_ids)